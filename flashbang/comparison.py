@@ -6,6 +6,7 @@ For details on model attributes and nomenclature, see simulation.py
 """
 import matplotlib.pyplot as plt
 import numpy as np
+from multiprocessing.pool import ThreadPool
 
 # flashbang
 from . import simulation
@@ -13,7 +14,7 @@ from .plotting.plotter import Plotter
 from .plotting.slider import FlashSlider
 from .plotting import plot_tools
 from . import tools
-from .config import Config
+from .config import check_config
 
 
 class Comparison:
@@ -27,6 +28,7 @@ class Comparison:
                  config=None,
                  verbose=True,
                  reload=False,
+                 threads=None,
                  ):
         """
         Parameters
@@ -39,45 +41,73 @@ class Comparison:
             Names of higher-level model collections (see simulation.py docstring)
         labels : [str]
             Labels for plotting. Defaults to `models`
-        config : str
+        config : str or Config
         verbose : bool
+        reload : bool
+        threads : int
+            number of models to load in parallel. Defaults to n_models (max 8),
+            or 1 if reload=True (every model rewrites its cache files)
         """
-        self.sims = {}
-        self.bounce = {}
+        self.sims = []
+        self.bounce = []
+        self._chk_index = []      # chk_table index arrays of each model
         self.verbose = verbose
-        self.config = Config(name=config, verbose=self.verbose)
+        self.config = check_config(config, verbose=self.verbose)
 
         self.n_models = len(models)
         self.runs = tools.ensure_sequence(runs, n=self.n_models)
         self.models = models
         self.model_sets = tools.ensure_sequence(model_sets, n=self.n_models)
         self.labels = labels
-        self.load_models(config=config, reload=reload)
+        self.load_models(reload=reload, threads=threads)
 
         if labels is None:
             self.labels = models
 
         self.baseline = models[0]
         self.baseline_sim = self.sims[0]
+        self._baseline_idx = 0
 
     # =======================================================
     #                      Loading
     # =======================================================
-    def load_models(self, config, reload=False):
+    def load_models(self, reload=False, threads=None):
         """Load all models
 
+        Models are independent, so are loaded in parallel threads
+        to overlap file I/O. Cache writes are serialized (see load_save.save_cache)
+
         Parameters
         ----------
-        config : str
+        reload : bool
+        threads : int
+            number of models to load in parallel. Defaults to n_models (max 8),
+            or 1 if reload=True (every model rewrites its cache files)
         """
-        for i, model in enumerate(self.models):
-            self.sims[i] = simulation.Simulation(run=self.runs[i],
-                                                 model=model,
-                                                 model_set=self.model_sets[i],
-                                                 config=config,
-                                                 verbose=self.verbose,
-                                                 reload=reload)
-            self.bounce[i] = self.sims[i].bounce
+        def load_model(i):
+            return simulation.Simulation(run=self.runs[i],
+                                         model=self.models[i],
+                                         model_set=self.model_sets[i],
+                                         config=self.config,
+                                         verbose=self.verbose,
+                                         reload=reload)
+
+        if threads is None:
+            if reload:
+                threads = 1
+            else:
+                threads = min(8, self.n_models)
+
+        if threads > 1:
+            with ThreadPool(processes=threads) as pool:
+                sims = pool.map(load_model, range(self.n_models))
+        else:
+            sims = [load_model(i) for i in range(self.n_models)]
+
+        for sim in sims:
+            self.sims += [sim]
+            self.bounce += [sim.bounce]
+            self._chk_index += [sim.chk_table.index.to_numpy()]
 
     # =======================================================
     #                      Plot
@@ -125,7 +155,7 @@ class Comparison:
             only plot data, neglecting all titles/labels/scales
         """
         chk = self._check_bounce(chk)
-        chk = tools.ensure_sequence(chk, n=self.n_models)
+        chk = np.broadcast_to(chk, self.n_models)
         title_str = self._get_title(chk=chk[0], title_str=title_str)
 
         plot = Plotter(ax=ax,
@@ -146,9 +176,7 @@ class Comparison:
                        legend_loc=legend_loc,
                        verbose=self.verbose)
 
-        for i, sim in self.sims.items():
-            model = self.models[i]
-
+        for i, sim in enumerate(self.sims):
             sim.plot_profile(chk=chk[i],
                              y_var=y_var,
                              x_var=x_var,
@@ -156,7 +184,7 @@ class Comparison:
                              y_factor=y_factor,
                              marker=marker,
                              linestyle=linestyle,
-                             trans=trans if model == self.baseline else False,
+                             trans=trans if i == self._baseline_idx else False,
                              ax=plot.ax,
                              label=self.labels[i],
                              data_only=True)
@@ -268,22 +296,24 @@ class Comparison:
                        y_scale=y_scale,
                        x_label=x_label,
                        y_label=y_label,
+                       x_factor=x_factor,
+                       y_factor=y_factor,
+                       linestyle=linestyle,
+                       marker=marker,
                        title=title,
                        title_str=title_str,
                        legend=legend,
                        legend_loc=legend_loc,
                        verbose=self.verbose)
 
-        for i, sim in self.sims.items():
-            sim.plot_dat(y_var=y_var,
-                         ax=plot.ax,
-                         label=self.labels[i],
-                         x_factor=x_factor,
-                         y_factor=y_factor,
-                         marker=marker,
-                         zero_time=zero_time,
-                         linestyle=linestyle,
-                         data_only=True)
+        for i, sim in enumerate(self.sims):
+            t_offset = 0
+            if zero_time:
+                t_offset = self.bounce[i]['time']
+
+            plot.plot(x=sim.get_dat_array('time') - t_offset,
+                      y=sim.get_dat_array(y_var),
+                      label=self.labels[i])
 
         if not data_only:
             plot.set_all()
@@ -328,7 +358,7 @@ class Comparison:
             only plot data, neglecting all titles/labels/scales
         """
         chk = self._check_bounce(chk)
-        chk = tools.ensure_sequence(chk, n=self.n_models)
+        chk = np.broadcast_to(chk, self.n_models)
         title_str = self._get_title(chk=chk[0], title_str=title_str)
 
         plot = Plotter(ax=ax,
@@ -349,15 +379,13 @@ class Comparison:
                        legend_loc=legend_loc,
                        verbose=self.verbose)
 
-        for i, sim in self.sims.items():
-            model = self.models[i]
-
+        for i, sim in enumerate(self.sims):
             sim.plot_composition(chk=chk[i],
                                  y_vars=y_vars,
                                  x_var=x_var,
                                  x_factor=x_factor,
                                  y_factor=y_factor,
-                                 trans=trans if model == self.baseline else False,
+                                 trans=trans if i == self._baseline_idx else False,
                                  ax=plot.ax,
                                  data_only=True)
             if i == 0:
@@ -484,29 +512,11 @@ class Comparison:
         x_var : str
         y_var : str
         """
-        profile = self.baseline_sim.profiles.sel(chk=chk)
-        x = profile[x_var]
-        y = profile[y_var]
+        x = self.baseline_sim.get_profile_array(chk=chk, var=x_var)
+        y = self.baseline_sim.get_profile_array(chk=chk, var=y_var)
 
         return x, y
 
-    def _get_trans_xy(self, chk, trans_key, x, y):
-        """Return x, y points of transition line, for given x-axis variable
-
-        parameters
-        ----------
-        chk : int
-        trans_key : str
-        x : []
-        y : []
-        """
-        trans_idx = self.baseline_sim.chk_table.loc[chk, f'{trans_key}_i']
-
-        trans_x = np.array([x[trans_idx], x[trans_idx]])
-        trans_y = np.array([np.min(y), np.max(y)])
-
-        return trans_x, trans_y
-
     def _plot_trans_lines(self, x_var, y_var, plot, chk,
                           linewidth=1):
         """Add transition line to axis
@@ -521,35 +531,28 @@ class Comparison:
         """
         x, y = self._get_baseline_xy(chk=chk, x_var=x_var, y_var=y_var)
 
-        for trans_key in self.baseline_sim.trans_dens:
-            trans_x, trans_y = self._get_trans_xy(chk=chk,
-                                                  trans_key=trans_key,
-                                                  x=x,
-                                                  y=y)
+        trans_idxs = self.baseline_sim.get_trans_idxs(chk)
 
-            plot.plot(x=trans_x,
-                      y=trans_y,
-                      linestyle='--',
-                      marker='',
-                      color='k',
-                      linewidth=linewidth)
+        segments = plot_tools.get_trans_segments(x=x,
+                                                 trans_idxs=trans_idxs,
+                                                 y_min=np.min(y),
+                                                 y_max=np.max(y))
+        plot.plot_segments(segments,
+                           linestyle='--',
+                           color='k',
+                           linewidth=linewidth)
 
     def _get_title(self, chk, title_str):
         """Get title string
 
+        Uses timesteps of baseline model
+
         Parameters
         ----------
         chk : int
         title_str : str or None
         """
-        if (title_str is None) and (chk is not None):
-            timestep = self.baseline_sim.timesteps.loc[chk, 'time']
-            bounce = self.baseline_sim.bounce['time']
-
-            timestep = timestep - bounce
-            title_str = f't = {timestep:.3f} s'
-
-        return title_str
+        return self.baseline_sim._get_title(chk=chk, title_str=title_str)
 
     def _check_factors(self, x_var, y_var, x_factor, y_factor):
         """Check if factors provided, otherwise use default
@@ -578,10 +581,9 @@ class Comparison:
         chk : str, int, or [int]
         """
         if chk == 'bounce':
-            chk = np.zeros(self.n_models, dtype='int')
-
-            for i in self.sims:
-                chk[i] = self.bounce[i]['chk']
+            chk = np.fromiter((self.bounce[i]['chk'] for i in range(self.n_models)),
+                              dtype=np.int64,
+                              count=self.n_models)
 
         return chk
 
@@ -591,22 +593,21 @@ class Comparison:
     def _get_slider_chk(self):
         """Return largest chk range common to all models
         """
-        mins = []
-        maxes = []
-
-        for sim in self.sims.values():
-            mins += [sim.chk_table.index.min()]
-            maxes += [sim.chk_table.index.max()]
-
-        chk_min = max(mins)
-        chk_max = min(maxes)
+        # chk indexes are sorted, so first/last are min/max
+        chk_min = np.maximum.reduce([index[0] for index in self._chk_index])
+        chk_max = np.minimum.reduce([index[-1] for index in self._chk_index])
         return chk_min, chk_max
 
     def _setup_slider(self, y_vars, trans, x_factor, y_factor):
         """Return slider fig
         """
         chk_min, chk_max = self._get_slider_chk()
-        chk_table = self.baseline_sim.chk_table.loc[chk_min:chk_max]
+        index = self._chk_index[self._baseline_idx]
+
+        # positional equivalent of .loc[chk_min:chk_max]
+        i_min = np.searchsorted(index, chk_min, side='left')
+        i_max = np.searchsorted(index, chk_max, side='right')
+        chk_table = self.baseline_sim.chk_table.iloc[i_min:i_max]
 
         slider = FlashSlider(y_vars=y_vars,
                              chk_table=chk_table,
@@ -625,17 +626,12 @@ class Comparison:
         trans : bool
         """
         lines = {}
-        trans_offset = 0
-        lines[self.baseline] = ax.lines[0]
-        sim_0 = self.baseline_sim
 
-        if trans:
-            trans_offset = len(sim_0.trans_dens)
-            for i, trans_key in enumerate(sim_0.trans_dens):
-                lines[trans_key] = ax.lines[1+i]
+        for i, model in enumerate(self.models):
+            lines[model] = ax.lines[i]
 
-        for i, model in enumerate(self.models[1:]):
-            lines[model] = ax.lines[1+trans_offset+i]
+        if trans:
+            lines['trans'] = ax.collections[0]
 
         return lines
 
@@ -649,12 +645,9 @@ class Comparison:
         y_var : str
         slider : FlashSlider
         """
-        for i, sim in self.sims.items():
-            profile = sim.profiles.sel(chk=chk)
-            x = profile[x_var]
-            y = profile[y_var]
-
-            slider.update_ax_line(x=x, y=y, y_var=f'{y_var}_{i}')
+        for i, sim in enumerate(self.sims):
+            xy = sim.get_profile_xy(chk=chk, x_var=x_var, y_var=y_var)
+            slider.update_ax_line(x=xy[:, 0], y=xy[:, 1], y_var=f'{y_var}_{i}')
 
     def _update_slider_trans(self, chk, x_var, y_var, slider):
         """Update trans lines on slider plot
@@ -666,6 +659,9 @@ class Comparison:
         y_var : str
         slider : FlashSlider
         """
-        x, y = self._get_baseline_xy(chk=chk, x_var=x_var, y_var=y_var)
-        slider.update_trans_lines(chk=chk, x=x, y=y)
+        x = self.baseline_sim.get_profile_array(chk=chk, var=x_var)
+        y_lims = self.baseline_sim.get_profile_lims(chk=chk, var=y_var)
+        slider.update_trans_lines(trans_idxs=self.baseline_sim.get_trans_idxs(chk),
+                                  x=x,
+                                  y=y_lims)
 
@@ -3,12 +3,20 @@
 import os
 import configparser
 import ast
+import copy
 
 # flashbang
 from .paths import config_filepath
 from .tools import printv
 
 
+# loaded config files, keyed by (filepath, mtime)
+_config_cache = {}
+
+# parsed config sections, keyed by raw section string
+_literal_cache = {}
+
+
 class ConfigError(Exception):
     pass
 
@@ -32,12 +40,67 @@ class Config:
             self.name = name
 
         self.verbose = verbose
-        self.config = load_config_file(name=self.name, verbose=self.verbose)
+        self.ini = load_config_file(name=self.name, verbose=self.verbose)
 
-        # override any options from plotting.ini
-        plot_config = load_config_file(name='plotting', verbose=self.verbose)
-        plot_config['plotting'].update(self.config['plotting'])
-        self.config.update(plot_config)
+        # fallback for any [plotting] options not overridden by self.ini
+        self.plot_ini = load_config_file(name='plotting', verbose=self.verbose)
+
+        self._parsed = {}  # parsed config sections, keyed by section name
+
+    # ===============================================================
+    #                  Parsing
+    # ===============================================================
+    def has_option(self, section, option):
+        """Check if config has given option
+
+        Returns : bool
+
+        Parameters
+        ----------
+        section : str
+        option : str
+        """
+        if self.ini.has_option(section, option):
+            return True
+        elif section == 'plotting':
+            return self.plot_ini.has_option(section, option)
+        else:
+            return False
+
+    def get(self, section, option):
+        """Get parsed config value
+
+        Parameters
+        ----------
+        section : str
+        option : str
+        """
+        return self.get_section(section)[option]
+
+    def get_section(self, section):
+        """Get all parsed values in config section
+
+        Sections are only parsed on first access.
+        Any [plotting] options missing from self.ini are taken from plotting.ini
+
+        Returns : {option: value}
+
+        Parameters
+        ----------
+        section : str
+        """
+        if section not in self._parsed:
+            values = {}
+
+            if section == 'plotting':
+                values.update(parse_section(self.plot_ini, section=section))
+
+            if self.ini.has_section(section):
+                values.update(parse_section(self.ini, section=section))
+
+            self._parsed[section] = values
+
+        return self._parsed[section]
 
     # ===============================================================
     #                  Accessing Properties
@@ -45,56 +108,46 @@ class Config:
     def profiles(self, var):
         """Get profiles property
         """
-        conf = self.config['profiles']
-
         if var == 'all':
-            return conf['params'] + conf['isotopes']
-        elif var not in conf:
+            return self.get('profiles', 'params') + self.get('profiles', 'isotopes')
+        elif not self.has_option('profiles', var):
             raise ConfigError(f"'{var}' not a valid profiles property")
         else:
-            return conf[var]
+            return self.get('profiles', var)
 
     def dat(self, var):
         """Get dat property
         """
-        conf = self.config['dat']
-
         if var == 'columns':
-            return self.config['dat_columns']
-        elif var in conf:
-            return conf[var]
+            return self.get_section('dat_columns')
+        elif self.has_option('dat', var):
+            return self.get('dat', var)
         else:
             raise ConfigError(f"'{var}' not a valid dat property")
 
     def trans(self, var):
         """Get transitions property
         """
-        conf = self.config['transitions']
-
-        if var not in conf:
+        if not self.has_option('transitions', var):
             raise ConfigError(f"'{var}' not a valid trans property")
         else:
-            return conf[var]
+            return self.get('transitions', var)
 
     def tracers(self, var):
         """Get tracers property
         """
-        conf = self.config['tracers']
-
-        if var not in conf:
+        if not self.has_option('tracers', var):
             raise ConfigError(f"'{var}' not a valid tracers property")
         else:
-            return conf[var]
+            return self.get('tracers', var)
 
     def plotting(self, var):
         """Get plotting property
         """
-        conf = self.config['plotting']
-
-        if var not in conf:
+        if not self.has_option('plotting', var):
             raise ConfigError(f"'{var}' not a valid plotting property")
         else:
-            return conf[var]
+            return self.get('plotting', var)
 
     def ax_scale(self, var):
         """Get axis scale for given var, default to 'linear'
@@ -132,9 +185,14 @@ class Config:
 
 
 def load_config_file(name, verbose=True):
-    """Load .ini config file and return as dict
+    """Load .ini config file
+
+    Files are cached by (filepath, mtime), so repeated loads only
+    re-read a config if the file has been modified since.
+    Values are left unparsed (see parse_section)
 
-    Returns : {}
+    Returns : configparser.ConfigParser
+        Note: shared between loads, so shouldn't be modified
 
     Parameters
     ----------
@@ -144,19 +202,46 @@ def load_config_file(name, verbose=True):
     filepath = config_filepath(name=name)
     printv(f'Loading config: {filepath}', verbose)
 
-    if not os.path.exists(filepath):
+    try:
+        key = (filepath, os.path.getmtime(filepath))
+    except FileNotFoundError:
         raise FileNotFoundError(f'Config file not found: {filepath}')
 
-    ini = configparser.ConfigParser()
-    ini.read(filepath)
+    if key not in _config_cache:
+        ini = configparser.ConfigParser()
+        ini.read(filepath)
+        _config_cache[key] = ini
 
-    config = {}
-    for section in ini.sections():
-        config[section] = {}
-        for option in ini.options(section):
-            config[section][option] = ast.literal_eval(ini.get(section, option))
+    return _config_cache[key]
 
-    return config
+
+def parse_section(ini, section):
+    """Evaluate all values in config section as python literals
+
+    All values are joined into a single tuple literal, so the section
+    is evaluated in one pass, rather than once per option.
+    Results are cached by raw section string
+
+    Returns : {option: value}
+
+    Parameters
+    ----------
+    ini : configparser.ConfigParser
+    section : str
+    """
+    options = ini.options(section)
+
+    # newline before each comma, so trailing comments don't swallow it
+    string = '(' + ''.join(f'({ini.get(section, option)}\n),\n'
+                           for option in options) + ')'
+
+    if string not in _literal_cache:
+        _literal_cache[string] = ast.literal_eval(string)
+
+    # copy so that mutable values aren't shared between configs
+    values = copy.deepcopy(_literal_cache[string])
+
+    return dict(zip(options, values))
 
 
 def check_config(config, verbose=True):
@@ -1,6 +1,5 @@
 import numpy as np
 import xarray as xr
-from scipy.interpolate import interp1d
 import astropy.units as units
 
 # flashbang
@@ -34,11 +33,15 @@ def extract_multi_tracers(mass_grid, profiles, params, verbose=True):
                           len(mass_grid),
                           len(params)])
 
+    # pull out raw arrays once, instead of selecting each chk from Dataset
+    arrays = {var: profiles[var].values for var in set(params) | {'mass'}}
+
     for i, chk in enumerate(chk_list):
         printv(f'\rchk: {chk}/{chk_list[-1]}', verbose, end='')
 
+        profile = {var: array[i] for var, array in arrays.items()}
         data_cube[i, :, :] = extract_tracers(mass_grid=mass_grid,
-                                             profile=profiles.sel(chk=i),
+                                             profile=profile,
                                              params=params)
     # construct xarray Dataset
     tracers = xr.Dataset()
@@ -63,16 +66,21 @@ def extract_tracers(mass_grid, profile, params):
     ----------
     mass_grid : [float]
         1D array of mass shells to track.
-    profile : pd.DataFrame
+        Must lie within the profile mass range (no extrapolation)
+    profile : xr.Dataset or {var: np.ndarray}
         profile table from a single chk, with columns of params (including mass shells)
         and rows of radial zones (see: load_save.extract_profile).
+        Mass must be monotonically increasing (true for enclosed mass)
     params : [str]
         list of profile quantities to extract.
     """
     out_array = np.zeros([len(mass_grid), len(params)])
+    mass = np.asarray(profile['mass'])
+
+    if (np.min(mass_grid) < mass[0]) or (np.max(mass_grid) > mass[-1]):
+        raise ValueError('mass_grid is outside the range of profile mass')
 
     for i, par in enumerate(params):
-        interp_func = interp1d(profile['mass'], profile[par])
-        out_array[:, i] = interp_func(mass_grid)
+        out_array[:, i] = np.interp(mass_grid, mass, profile[par])
 
     return out_array
@@ -15,20 +15,36 @@ General terminology
     get: Get reduced data by first attempting 'load', then fall back on 'extract'
 """
 import os
+import mmap
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 import xarray as xr
-import subprocess
+import shutil
 import sys
-import yt
 import h5py
+import threading
+import multiprocessing as mp
 
 # flashbang
 from . import paths
-from .quantities import get_mass_enclosed
+from .quantities import (get_mass_enclosed, get_leaf_blocks, get_cell_edges,
+                         get_cell_centres, get_cell_volumes)
 from .extract_tracers import extract_multi_tracers
 from .tools import get_missing_elements, printv
-from .config import Config, check_config
+from .config import check_config
+
+# cache directories already created/checked this session
+_ensured_dirs = set()
+
+# in-memory copies of loaded cache files, keyed by (filepath, mtime, columns)
+_memory_cache = OrderedDict()
+_memory_cache_size = 256                 # max number of cached objects
+_memory_cache_names = ('dat', 'profile')  # cache types held in memory
+_memory_cache_lock = threading.Lock()     # e.g. Comparison loads models in threads
+
+# serializes cache writes between threads (e.g. models sharing cache files)
+_save_lock = threading.Lock()
 
 
 # ===============================================================
@@ -36,9 +52,14 @@ from .config import Config, check_config
 # ===============================================================
 def load_cache(name, run, model, model_set,
                chk=None,
+               columns=None,
+               lazy=False,
                verbose=True):
     """Load pre-cached data
 
+    dat and profile caches are also kept in memory (up to _memory_cache_size),
+    so repeated loads skip the file read. Free with clear_memory_cache()
+
     parameters
     ----------
     name : str
@@ -46,6 +67,12 @@ def load_cache(name, run, model, model_set,
     model : str
     model_set : str
     chk : int
+    columns : [str]
+        subset of columns/variables to load. Defaults to all
+        For netcdf caches, only these variables are read from file
+    lazy : bool
+        for netcdf caches, only open file and load values on access
+        (e.g. a single chk of a multiprofile). Not held in memory cache
     verbose : bool
     """
     filepath = paths.cache_filepath(name,
@@ -56,21 +83,63 @@ def load_cache(name, run, model, model_set,
 
     printv(f'Loading {name} cache: {filepath}', verbose)
 
+    # check for copy already loaded in memory
+    key = None
+    if (name in _memory_cache_names) and not lazy:
+        if columns is not None:
+            columns = tuple(columns)
+
+        key = (filepath, os.path.getmtime(filepath), columns)
+
+        with _memory_cache_lock:
+            cached = _memory_cache.get(key)
+            if cached is not None:
+                _memory_cache.move_to_end(key)
+
+        if cached is not None:
+            return cached.copy(deep=True)
+
     if name in ['dat', 'chk_table', 'timesteps']:
         data = pd.read_pickle(filepath)
 
         if name in ['timesteps']:
             data.set_index('chk', inplace=True)
 
+        if columns is not None:
+            data = data[list(columns)]
+
     elif name in ['multiprofile', 'profile', 'tracers']:
-        data = xr.load_dataset(filepath)
+        if lazy:
+            data = xr.open_dataset(filepath)
+            if columns is not None:
+                data = data[list(columns)]
+        elif columns is None:
+            data = xr.load_dataset(filepath)
+        else:
+            with xr.open_dataset(filepath) as dataset:
+                data = dataset[list(columns)].load()
 
     else:
         raise ValueError(f"'{name}' not a valid cache type")
 
+    if key is not None:
+        with _memory_cache_lock:
+            _memory_cache[key] = data
+            if len(_memory_cache) > _memory_cache_size:
+                _memory_cache.popitem(last=False)  # drop least-recently used
+
+        data = data.copy(deep=True)  # protect cached copy from modification
+
     return data
 
 
+def clear_memory_cache():
+    """Clear in-memory copies of loaded cache files (see load_cache)
+    """
+    with _memory_cache_lock:
+        _memory_cache.clear()
+
+
 def save_cache(name, data, run, model, model_set,
                chk=None,
                verbose=True):
@@ -96,17 +165,51 @@ def save_cache(name, data, run, model, model_set,
 
     printv(f'Saving {name} cache: {filepath}', verbose)
 
-    if name in ['dat', 'chk_table', 'timesteps']:
-        if name in ['timesteps']:
-            data = data.reset_index()
+    with _save_lock:
+        if name in ['dat', 'chk_table', 'timesteps']:
+            if name in ['timesteps']:
+                data = data.reset_index()
 
-        data.to_pickle(filepath)
+            data.to_pickle(filepath)
 
-    elif name in ['multiprofile', 'profile', 'tracers']:
-        data.to_netcdf(filepath)
+        elif name in ['multiprofile', 'profile', 'tracers']:
+            data.to_netcdf(filepath)
 
-    else:
-        raise ValueError(f"'{name}' not a valid cache type")
+        else:
+            raise ValueError(f"'{name}' not a valid cache type")
+
+
+def cache_is_stale(name, raw_name, run, model, model_set, chk=None):
+    """Check if raw FLASH file has been modified since cache file was saved
+
+    Returns : bool
+        False if either file doesn't exist
+
+    parameters
+    ----------
+    name : str
+        name of cache file (see paths.cache_filename)
+    raw_name : str
+        name of raw FLASH file the cache is extracted from (see paths.flash_filename)
+    run : str
+    model : str
+    model_set : str
+    chk : int
+    """
+    cache_filepath = paths.cache_filepath(name,
+                                          run=run,
+                                          model=model,
+                                          model_set=model_set,
+                                          chk=chk)
+    raw_filepath = paths.flash_filepath(raw_name,
+                                        run=run,
+                                        model=model,
+                                        model_set=model_set,
+                                        chk=chk)
+    try:
+        return os.path.getmtime(raw_filepath) > os.path.getmtime(cache_filepath)
+    except FileNotFoundError:
+        return False
 
 
 # =======================================================================
@@ -146,16 +249,19 @@ def get_dat(run, model, model_set,
     if derived is None:
         derived = config.dat('derived')
 
-    # attempt to load cache file
+    # attempt to load cache file (if .dat hasn't since been modified)
     if not reload:
-        try:
-            dat_table = load_cache('dat',
-                                   run=run,
-                                   model=model,
-                                   model_set=model_set,
-                                   verbose=verbose)
-        except FileNotFoundError:
-            printv('dat cache not found, reloading', verbose)
+        if cache_is_stale('dat', raw_name='dat', run=run, model=model, model_set=model_set):
+            printv('dat file modified since cache, reloading', verbose)
+        else:
+            try:
+                dat_table = load_cache('dat',
+                                       run=run,
+                                       model=model,
+                                       model_set=model_set,
+                                       verbose=verbose)
+            except FileNotFoundError:
+                printv('dat cache not found, reloading', verbose)
 
     # fall back on loading raw .dat
     if dat_table is None:
@@ -224,8 +330,8 @@ def extract_dat(run, model, model_set,
                       names=keys,
                       skiprows=1,
                       header=None,
-                      delim_whitespace=True,
-                      low_memory=False,
+                      engine='c',
+                      sep=r'\s+',
                       dtype='float64')
 
     dat.sort_values('time', inplace=True)  # ensure monotonic
@@ -253,14 +359,18 @@ def add_heat_eff(dat):
     dat['heat_eff'] = gain_heat / (lnue + lnueb + gain_heat)
 
 
-def print_dat_colnames(run, model, model_set):
+def print_dat_colnames(run, model, model_set, verbose=True):
     """Print all column names from .dat file
 
+    Returns : {int: str}
+        column names, keyed by (1-indexed) column
+
     parameters
     ----------
     run : str
     model : str
     model_set : str
+    verbose : bool
     """
     filepath = paths.flash_filepath('dat',
                                     run=run,
@@ -270,15 +380,25 @@ def print_dat_colnames(run, model, model_set):
     with open(filepath, 'r') as f:
         colnames = f.readline().split()
 
+    columns = {}
     count = 1
+    count_str = str(count)
+
     for word in colnames:
-        if str(count) in word:
-            print(f'\n{count}', end=' ')
+        if count_str in word:
+            columns[count] = []
             count += 1
-        else:
-            print(word, end=' ')
-            
-            
+            count_str = str(count)
+        elif len(columns) > 0:
+            columns[count - 1] += [word]
+
+    columns = {idx: ' '.join(words) for idx, words in columns.items()}
+
+    printv('\n'.join(f'{idx} {name}' for idx, name in columns.items()), verbose)
+
+    return columns
+
+
 # ===============================================================
 #                      Profiles
 # ===============================================================
@@ -289,6 +409,9 @@ def get_multiprofile(run, model, model_set,
                      config=None,
                      reload=False,
                      save=True,
+                     threads=1,
+                     lazy=False,
+                     dtype=None,
                      verbose=True):
     """Get all available profiles as multiprofile Dataset
         see: get_all_profiles()
@@ -304,6 +427,13 @@ def get_multiprofile(run, model, model_set,
     config : str or Config
     reload : bool
     save : bool
+    threads : int
+        number of processes for extracting profiles in parallel
+    lazy : bool
+        only open multiprofile cache, loading values on access
+    dtype : type
+        cast profile variables to dtype (e.g. np.float32), after saving cache.
+        Note: casting loads all values into memory, so overrides lazy
     verbose : bool
     """
     def save_file():
@@ -315,6 +445,8 @@ def get_multiprofile(run, model, model_set,
                        model_set=model_set,
                        verbose=verbose)
 
+    config = check_config(config, verbose=verbose)
+
     if chk_list is None:
         chk_list = find_chk(run=run,
                             model=model,
@@ -327,6 +459,7 @@ def get_multiprofile(run, model, model_set,
         multiprofile = try_load_multiprofile(run=run,
                                              model=model,
                                              model_set=model_set,
+                                             lazy=lazy,
                                              verbose=verbose)
 
     # 2. Reload individual profiles
@@ -338,14 +471,33 @@ def get_multiprofile(run, model, model_set,
                                     params=params,
                                     derived_params=derived_params,
                                     save=save,
+                                    threads=threads,
                                     verbose=verbose,
                                     config=config)
 
         multiprofile = join_profiles(profiles, verbose=verbose)
         save_file()
 
-    # 3. Check for missing profiles
+    # 3. Check for missing derived params and profiles
     else:
+        # derive over the full chk stack at once, rather than re-extracting chks
+        derived = derived_params
+        if params is None:
+            derived = config.profiles('derived_params')
+        elif derived is None:
+            derived = []
+
+        missing_derived = [var for var in derived
+                           if (var != 'mass') and (var not in multiprofile)]
+
+        if len(missing_derived) > 0:
+            printv(f'Deriving missing profile params: {missing_derived}', verbose=verbose)
+            multiprofile.load()
+            multiprofile.close()
+
+            add_derived_profiles(multiprofile, derived_params=missing_derived, config=config)
+            save_file()
+
         multi_chk = multiprofile.coords['chk'].values
         missing_chk = get_missing_elements(chk_list, multi_chk)
 
@@ -357,14 +509,22 @@ def get_multiprofile(run, model, model_set,
                                                 chk_list=missing_chk,
                                                 params=params,
                                                 save=save,
+                                                threads=threads,
                                                 verbose=verbose,
                                                 derived_params=derived_params,
                                                 config=config)
 
+            # fully load (and release file) before it's overwritten
+            multiprofile.load()
+            multiprofile.close()
+
             multiprofile = append_to_multiprofile(multiprofile,
                                                   profiles=missing_profiles)
             save_file()
 
+    if dtype is not None:
+        multiprofile = multiprofile.astype(dtype)
+
     return multiprofile
 
 
@@ -375,10 +535,14 @@ def get_all_profiles(run, model, model_set,
                      config=None,
                      reload=False,
                      save=True,
+                     threads=1,
                      verbose=True):
     """Get all available chk profiles
         see: get_profile()
 
+    Cached profiles are loaded in full (not subset to params),
+    as they are joined and saved as the multiprofile
+
     Returns: {chk: profile}
 
     parameters
@@ -392,6 +556,9 @@ def get_all_profiles(run, model, model_set,
     config : str or Config
     reload : bool
     save : bool
+    threads : int
+        number of processes for extracting profiles in parallel
+        (each chk file is independent)
     verbose : bool
     """
     printv(f'Loading chk profiles', verbose=verbose)
@@ -402,27 +569,53 @@ def get_all_profiles(run, model, model_set,
                             model_set=model_set,
                             verbose=verbose)
 
-    profiles = {}
-    chk_max = chk_list[-1]
+    # load config once, rather than for every chk
+    config = check_config(config, verbose=verbose)
 
-    for chk in chk_list:
-        printv(f'\rchk: {chk}/{chk_max}', end='', verbose=verbose)
+    if threads > 1:
+        printv(f'Using {threads} threads', verbose=verbose)
+        args = [(chk, run, model, model_set, params, derived_params,
+                 config, reload, save, False, False) for chk in chk_list]
+
+        # starmap preserves order of chk_list
+        with mp.Pool(processes=threads) as pool:
+            profiles = dict(zip(chk_list, pool.starmap(get_profile, args)))
+    else:
+        profiles = {}
+        chk_max = chk_list[-1]
+
+        for i, chk in enumerate(chk_list):
+            printv(f'\rchk: {chk}/{chk_max}', end='', verbose=verbose)
+
+            # start reading next chk file while this one is processed
+            if i + 1 < len(chk_list):
+                next_chk = chk_list[i + 1]
+                next_cache = paths.cache_filepath('profile',
+                                                  chk=next_chk,
+                                                  run=run,
+                                                  model=model,
+                                                  model_set=model_set)
+
+                if reload or not os.path.exists(next_cache):
+                    prefetch_chk(next_chk, run=run, model=model, model_set=model_set)
+
+            profiles[chk] = get_profile(chk,
+                                        run=run,
+                                        model=model,
+                                        model_set=model_set,
+                                        params=params,
+                                        derived_params=derived_params,
+                                        config=config,
+                                        reload=reload,
+                                        save=save,
+                                        subset=False,
+                                        verbose=False)
+        printv('', verbose=verbose)
 
-        profiles[chk] = get_profile(chk,
-                                    run=run,
-                                    model=model,
-                                    model_set=model_set,
-                                    params=params,
-                                    derived_params=derived_params,
-                                    config=config,
-                                    reload=reload,
-                                    save=save,
-                                    verbose=False)
-    printv('', verbose=verbose)
     return profiles
 
 
-def try_load_multiprofile(run, model, model_set, verbose=True):
+def try_load_multiprofile(run, model, model_set, lazy=False, verbose=True):
     """Attempt to load cached multiprofile
 
    Returns : xr.Dataset, or None
@@ -432,6 +625,7 @@ def try_load_multiprofile(run, model, model_set, verbose=True):
    run : str
    model : str
    model_set : str
+   lazy : bool
    verbose : bool
    """
     multiprofile = None
@@ -440,6 +634,7 @@ def try_load_multiprofile(run, model, model_set, verbose=True):
                                   run=run,
                                   model=model,
                                   model_set=model_set,
+                                  lazy=lazy,
                                   verbose=verbose)
     except FileNotFoundError:
         printv('multiprofile cache not found, reloading', verbose=verbose)
@@ -454,6 +649,7 @@ def get_profile(chk, run, model, model_set,
                 config=None,
                 reload=False,
                 save=True,
+                subset=True,
                 verbose=True):
     """Get reduced radial profile, as contained in checkpoint file
     Loads pre-extracted profile if available, otherwise from raw file
@@ -475,9 +671,20 @@ def get_profile(chk, run, model, model_set,
         force reload from chk file, else try to load pre-extracted profile
     save : bool
         save extracted profile to file for faster loading
+    subset : bool
+        only read params (and derived_params) from the cache file.
+        Use False if the full profile is needed (e.g. to join into multiprofile)
     verbose : bool
     """
     profile = None
+    partial_cache = False  # cache exists, but is missing requested params
+
+    # only read requested params from cache (stored without padding)
+    columns = None
+    if subset and (params is not None):
+        columns = [var.strip() for var in params]
+        if derived_params is not None:
+            columns += list(derived_params)
 
     # attempt to load cache file
     if not reload:
@@ -487,9 +694,13 @@ def get_profile(chk, run, model, model_set,
                                  run=run,
                                  model=model,
                                  model_set=model_set,
+                                 columns=columns,
                                  verbose=verbose)
         except FileNotFoundError:
             printv('profile cache not found, reloading', verbose)
+        except KeyError:
+            printv('params missing from profile cache, reloading', verbose)
+            partial_cache = True
 
     # fall back on loading raw chk
     if profile is None:
@@ -500,7 +711,11 @@ def get_profile(chk, run, model, model_set,
                                   config=config,
                                   params=params,
                                   derived_params=derived_params)
-        if save:
+
+        # don't overwrite existing (fuller) cache with requested subset
+        if save and partial_cache:
+            printv('Not saving profile subset over existing cache', verbose)
+        elif save:
             save_cache('profile',
                        data=profile,
                        chk=chk,
@@ -581,44 +796,110 @@ def extract_profile(chk, run, model, model_set,
         params = config.profiles('all')
         derived_params = config.profiles('derived_params')
 
-    profile = xr.Dataset()
-    chk_raw = load_chk(chk=chk, run=run, model=model, model_set=model_set)
-    chk_data = chk_raw.all_data()
+    chk_h5py = load_chk(chk=chk,
+                        run=run,
+                        model=model,
+                        model_set=model_set,
+                        use_h5py=True)
 
-    for var in params:
-        profile[var.strip()] = ('zone', np.array(chk_data[var]))
+    chk_vars = read_chk_vars(chk_h5py, params=params)
 
-    if 'mass' in derived_params:
-        chk_h5py = load_chk(chk=chk,
-                            run=run,
-                            model=model,
-                            model_set=model_set,
-                            use_h5py=True)
+    # fall back on yt for any derived fields not stored in the chk file
+    yt_params = [var for var in params if var not in chk_vars]
+    if len(yt_params) > 0:
+        chk_raw = load_chk(chk=chk, run=run, model=model, model_set=model_set)
+        chk_data = chk_raw.all_data()
 
-        add_mass_profile(profile=profile, chk_h5py=chk_h5py)
-        chk_h5py.close()
+        for var in yt_params:
+            chk_vars[var] = chk_data[var].d  # unitless view, avoids copy
 
-    if 'yl' in derived_params:
-        add_yl_profile(profile)
+    profile_vars = {var.strip(): ('zone', chk_vars[var]) for var in params}
 
-    if 'abar' in derived_params:
-        add_abar_profile(profile)
+    # calculate mass from arrays already in hand (see add_mass_profile)
+    if 'mass' in derived_params:
+        if ('r' not in chk_vars) or ('dens' not in chk_vars):
+            raise ValueError(f'Need radius and density columns (r, dens) to calculate mass')
 
-    if 'sumx' in derived_params:
-        add_sumx_profile(profile, isotopes=config.profiles('isotopes'))
+        mass = get_mass_enclosed(radius=chk_vars['r'],
+                                 density=chk_vars['dens'],
+                                 chk_h5py=chk_h5py)
+        profile_vars['mass'] = ('zone', mass)
 
-    if 'c_s' in derived_params:
-        add_c_s_profile(profile)
+    chk_h5py.close()
+
+    # build Dataset in one go, rather than adding variables one at a time
+    profile = xr.Dataset(profile_vars)
+    add_derived_profiles(profile, derived_params=derived_params, config=config)
 
-    if 'mach' in derived_params:
-        add_mach_profile(profile)
-        
     n_zones = len(profile['zone'])
     profile.coords['zone'] = np.arange(n_zones)  # set coords (mostly for concat later)
 
     return profile
 
 
+def read_chk_vars(chk_h5py, params):
+    """Read radial profiles of chk variables directly from hdf5 (bypassing yt)
+
+    Handles variables stored in the chk file, plus the geometric
+    fields 'r', 'cell_volume' and 'cell_mass'.
+    Any other params (e.g. derived yt fields) are skipped.
+    Only supports 1D spherical models: for any other geometry,
+    returns no variables, so that everything falls back on yt
+
+    Returns : {var: np.ndarray}
+
+    parameters
+    ----------
+    chk_h5py : h5py.File
+    params : [str]
+        profile parameters to read
+    """
+    def read_leaf_cells(name):
+        """Read variable and flatten leaf blocks into 1D array of cells
+        """
+        return chk_h5py[name][()][leaf_i].reshape(-1)
+
+    chk_vars = {}
+    if not is_1d_spherical(chk_h5py):
+        return chk_vars
+
+    leaf_i = get_leaf_blocks(chk_h5py)
+    # FLASH pads variable names to 4 characters (e.g. 'ye  ')
+    unknown_names = {name.decode().strip(): name.decode()
+                     for name in chk_h5py['unknown names'][:, 0]}
+    cell_edges = get_cell_edges(chk_h5py)
+
+    for var in params:
+        name = var.strip()  # config params may also be padded
+
+        if name == 'r':
+            chk_vars[var] = get_cell_centres(cell_edges)
+        elif name == 'cell_volume':
+            chk_vars[var] = get_cell_volumes(cell_edges)
+        elif (name == 'cell_mass') and ('dens' in unknown_names):
+            chk_vars[var] = read_leaf_cells(unknown_names['dens']) * get_cell_volumes(cell_edges)
+        elif name in unknown_names:
+            chk_vars[var] = read_leaf_cells(unknown_names[name])
+
+    return chk_vars
+
+
+def is_1d_spherical(chk_h5py):
+    """Check if chk file is from a 1D spherical model
+
+    Returns : bool
+        False if geometry or dimensionality aren't recorded in chk file
+
+    parameters
+    ----------
+    chk_h5py : h5py.File
+    """
+    chk_params = read_chk_parameters(chk_h5py)
+    geometry = str(chk_params.get('geometry', '')).lower()
+
+    return (geometry == 'spherical') and (chk_params.get('dimensionality') == 1)
+
+
 def add_mass_profile(profile, chk_h5py):
     """Calculate enclosed mass profile and add to profile table
 
@@ -631,12 +912,43 @@ def add_mass_profile(profile, chk_h5py):
     if ('r' not in profile) or ('dens' not in profile):
         raise ValueError(f'Need radius and density columns (r, dens) to calculate mass')
 
-    mass = get_mass_enclosed(radius=np.array(profile['r']),
-                             density=np.array(profile['dens']),
+    mass = get_mass_enclosed(radius=profile['r'].values,
+                             density=profile['dens'].values,
                              chk_h5py=chk_h5py)
     profile['mass'] = ('zone', mass)
 
 
+def add_derived_profiles(profile, derived_params, config=None):
+    """Add derived params to profile (except mass, which needs the chk file)
+
+    Works on a single profile, or a whole multiprofile at once,
+    as the derived params are elementwise over all dimensions
+
+    parameters
+    ----------
+    profile : xr.Dataset
+        single profile (see: extract_profile),
+        or multiprofile (see: join_profiles)
+    derived_params : [str]
+    config : str or Config
+    """
+    if 'yl' in derived_params:
+        add_yl_profile(profile)
+
+    if 'abar' in derived_params:
+        add_abar_profile(profile)
+
+    if 'sumx' in derived_params:
+        config = check_config(config)
+        add_sumx_profile(profile, isotopes=config.profiles('isotopes'))
+
+    if 'c_s' in derived_params:
+        add_c_s_profile(profile)
+
+    if 'mach' in derived_params:
+        add_mach_profile(profile)
+
+
 def add_yl_profile(profile):
     """Add lepton fraction (Y_l) to profile
 
@@ -648,8 +960,7 @@ def add_yl_profile(profile):
         raise ValueError(f'Need electron- and nu- fraction columns (ye, ynu)'
                          ' to calculate lepton fraction (yl)')
 
-    yl = profile['ye'] + profile['ynu']
-    profile['yl'] = ('zone', yl.data)
+    profile['yl'] = profile['ye'] + profile['ynu']
 
 
 def add_abar_profile(profile):
@@ -662,8 +973,7 @@ def add_abar_profile(profile):
     if 'sumy' not in profile:
         raise ValueError(f'Need sumy in profile to calculate abar')
 
-    abar = 1 / profile['sumy']
-    profile['abar'] = ('zone', abar.data)
+    profile['abar'] = 1 / profile['sumy']
 
 
 def add_sumx_profile(profile, isotopes):
@@ -675,16 +985,19 @@ def add_sumx_profile(profile, isotopes):
     isotopes : [str]
         list of all isotopes
     """
-    sumx = np.zeros(len(profile['zone']))
+    x_arrays = []
 
     for isotope in isotopes:
         isotope = isotope.strip()
         if isotope not in profile:
             raise ValueError(f"isotope '{isotope}' not found in model")
 
-        sumx += profile[isotope]
+        x_arrays += [profile[isotope]]
 
-    profile['sumx'] = ('zone', sumx)
+    if len(x_arrays) == 0:
+        profile['sumx'] = xr.zeros_like(profile['zone'], dtype=float)
+    else:
+        profile['sumx'] = sum(x_arrays[1:], x_arrays[0])
 
 
 def add_c_s_profile(profile):
@@ -697,8 +1010,7 @@ def add_c_s_profile(profile):
     if ('gamc' not in profile) or ('pres' not in profile) or ('dens' not in profile):
         raise ValueError(f'Need gamc, pres and dens to calculate c_s')
 
-    c_s = np.sqrt(profile['gamc'] * profile['pres'] / profile['dens'])
-    profile['c_s'] = ('zone', c_s.data)
+    profile['c_s'] = np.sqrt(profile['gamc'] * profile['pres'] / profile['dens'])
 
 
 def add_mach_profile(profile):
@@ -711,8 +1023,7 @@ def add_mach_profile(profile):
     if ('velx' not in profile) or ('c_s' not in profile):
         raise ValueError(f'Need velx and c_s to calculate mach')
 
-    mach = profile['velx'] / profile['c_s']
-    profile['mach'] = ('zone', mach.data)
+    profile['mach'] = profile['velx'] / profile['c_s']
 
 
 # ===============================================================
@@ -734,16 +1045,16 @@ def find_chk(run, model, model_set,
     verbose : bool
     """
     output_path = paths.output_path(model=model, model_set=model_set)
-    file_list = os.listdir(output_path)
     match_str = f'{run}_hdf5_chk_'
-    chks = []
     printv(f'Searching for chk files: {output_path}/{match_str}' + n_digits*'*', verbose)
 
-    for file in file_list:
-        if match_str in file:
-            chks += [int(file[-n_digits:])]
+    with os.scandir(output_path) as entries:
+        chks = np.fromiter((int(entry.name[-n_digits:]) for entry in entries
+                            if entry.name.startswith(match_str)),
+                           dtype=int)
+    chks.sort()
 
-    return np.sort(chks)
+    return chks
 
 
 def load_chk(chk, run, model, model_set, use_h5py=False):
@@ -763,13 +1074,47 @@ def load_chk(chk, run, model, model_set, use_h5py=False):
                                     model=model,
                                     model_set=model_set)
 
-    if not os.path.exists(filepath):
+    try:
+        if use_h5py:
+            return h5py.File(filepath, 'r')  # be careful to close this when done
+        else:
+            import yt  # lazy import: slow to import, and only needed here
+            return yt.load(filepath)
+
+    except FileNotFoundError:
         raise FileNotFoundError(f'checkpoint {chk:04d} file does not exist: {filepath}')
 
-    if use_h5py:
-        return h5py.File(filepath, 'r')  # be careful to close this when done
-    else:
-        return yt.load(filepath)
+
+def prefetch_chk(chk, run, model, model_set):
+    """Ask the OS to start reading a chk file into the page cache (non-blocking)
+
+    Lets file I/O for the next chk overlap with processing the current one.
+    Does nothing on platforms without posix_fadvise, or if file is missing
+
+    parameters
+    ----------
+    chk : int
+    run : str
+    model : str
+    model_set : str
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+
+    filepath = paths.flash_filepath('chk',
+                                    chk=chk,
+                                    run=run,
+                                    model=model,
+                                    model_set=model_set)
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except FileNotFoundError:
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
 
 
 # ===============================================================
@@ -793,10 +1138,8 @@ def get_chk_table(run, model, model_set,
     verbose : bool
     """
     chk_table = pd.DataFrame()
-    chk_list = find_chk(run=run,
-                        model=model,
-                        model_set=model_set,
-                        verbose=verbose)
+    output_path = paths.output_path(model=model, model_set=model_set)
+    dir_mtime = os.stat(output_path).st_mtime_ns
 
     # attempt to load cache file
     if not reload:
@@ -809,10 +1152,23 @@ def get_chk_table(run, model, model_set,
         except FileNotFoundError:
             printv('chk_table cache not found, reloading', verbose)
 
+    # skip re-scanning for chk files if output directory is unchanged
+    if (len(chk_table) > 0) and (chk_table.attrs.get('dir_mtime') == dir_mtime):
+        return chk_table
+
+    chk_list = find_chk(run=run,
+                        model=model,
+                        model_set=model_set,
+                        verbose=verbose)
+
     # fall back on creating new chk_table
     if len(chk_table) == 0 or (len(chk_table) != len(chk_list)):
         chk_table = extract_chk_table(chk_list)
 
+    # record directory state that chk_table was checked against
+    if chk_table.attrs.get('dir_mtime') != dir_mtime:
+        chk_table.attrs['dir_mtime'] = dir_mtime
+
         if save:
             save_cache('chk_table',
                        data=chk_table,
@@ -834,9 +1190,7 @@ def extract_chk_table(chk_list):
     chk_list : [int]
         list of chk files available; see find_chk()
     """
-    chk_table = pd.DataFrame()
-    chk_table['chk'] = chk_list
-    chk_table.set_index('chk', inplace=True)
+    chk_table = pd.DataFrame(index=pd.Index(chk_list, name='chk'))
 
     return chk_table
 
@@ -848,6 +1202,7 @@ def get_timesteps(run, model, model_set,
                   params=('time', 'nstep'),
                   reload=False,
                   save=True,
+                  threads=1,
                   verbose=True):
     """Get table of timestep quantities (time, n_steps, etc.) from chk files
 
@@ -861,6 +1216,8 @@ def get_timesteps(run, model, model_set,
     params : [str]
     reload : bool
     save : bool
+    threads : int
+        number of processes for extracting missing chk timesteps
     verbose : bool
     """
     timesteps = None
@@ -891,7 +1248,9 @@ def get_timesteps(run, model, model_set,
                                                       run=run,
                                                       model=model,
                                                       model_set=model_set,
-                                                      params=params)
+                                                      params=params,
+                                                      threads=threads,
+                                                      verbose=verbose)
 
             timesteps = timesteps.combine_first(missing_timesteps)
 
@@ -908,6 +1267,7 @@ def get_timesteps(run, model, model_set,
 
 def extract_timesteps_chk(chk_list, run, model, model_set,
                           params=('time', 'nstep'),
+                          threads=1,
                           verbose=True):
     """Extract timesteps from chk files
 
@@ -922,28 +1282,40 @@ def extract_timesteps_chk(chk_list, run, model, model_set,
     model : str
     model_set : str
     params : [str]
+    threads : int
+        number of processes to extract chk files in parallel
     verbose : bool
     """
     arrays = {key: [] for key in params}
-    arrays['chk'] = chk_list
 
-    for i, chk in enumerate(chk_list):
-        printv(f'\rLoading timestep, chk: {chk}/{chk_list[-1]}',
-               end='', verbose=verbose)
+    if threads > 1:
+        printv(f'Loading {len(chk_list)} timesteps ({threads} threads)', verbose)
+        args = [(chk, run, model, model_set, params) for chk in chk_list]
+        chunksize = max(1, len(chk_list) // (4 * threads))
 
-        chk_values = extract_chk_parameters(chk=chk,
-                                            run=run,
-                                            model=model,
-                                            model_set=model_set,
-                                            params=params)
+        # starmap preserves order of chk_list
+        with mp.Pool(processes=threads) as pool:
+            all_values = pool.starmap(extract_chk_parameters, args,
+                                      chunksize=chunksize)
+    else:
+        all_values = []
+
+        for chk in chk_list:
+            printv(f'\rLoading timestep, chk: {chk}/{chk_list[-1]}',
+                   end='', verbose=verbose)
 
+            all_values += [extract_chk_parameters(chk=chk,
+                                                  run=run,
+                                                  model=model,
+                                                  model_set=model_set,
+                                                  params=params)]
+        printv('', verbose=verbose)
+
+    for chk_values in all_values:
         for par, value in chk_values.items():
             arrays[par] += [value]
 
-    printv('', verbose=verbose)
-
-    table = pd.DataFrame(arrays)
-    table.set_index('chk', inplace=True)
+    table = pd.DataFrame(arrays, index=pd.Index(chk_list, name='chk'))
 
     return table
 
@@ -961,15 +1333,49 @@ def extract_chk_parameters(chk, run, model, model_set, params):
     model_set : str
     params : [str]
     """
-    values = {}
-    chk_raw = load_chk(chk, run=run, model=model, model_set=model_set)
+    with load_chk(chk, run=run, model=model, model_set=model_set,
+                  use_h5py=True) as chk_h5py:
+        chk_params = read_chk_parameters(chk_h5py)
 
+    values = {}
     for par in params:
-        values[par] = chk_raw.parameters[par]
+        values[par] = chk_params[par]
 
     return values
 
 
+def read_chk_parameters(chk_h5py):
+    """Read scalar and runtime parameters directly from hdf5 (bypassing yt)
+
+    Matches the yt parameters dict: runtime parameters
+    override any scalars of the same name
+
+    Returns: {param: value}
+
+    parameters
+    ----------
+    chk_h5py : h5py.File
+    """
+    chk_params = {}
+
+    # runtime parameters are read last, so override scalars of any dtype
+    for kind in ['scalars', 'runtime parameters']:
+        for dtype in ['integer', 'real', 'logical', 'string']:
+            key = f'{dtype} {kind}'
+            if key not in chk_h5py:
+                continue
+
+            table = chk_h5py[key][()]
+
+            for name, value in zip(table['name'], table['value']):
+                if dtype == 'string':
+                    value = value.strip().decode('ascii', 'ignore')
+
+                chk_params[name.strip().decode('ascii', 'ignore')] = value
+
+    return chk_params
+
+
 # ===============================================================
 #                      Log files
 # ===============================================================
@@ -994,16 +1400,24 @@ def get_bounce_time(run, model, model_set,
     bounce_time = 0.0
     printv(f'Getting bounce time: {filepath}', verbose)
 
-    with open(filepath, 'r') as f:
-        for line in f:
-            if match_str in line:
-                terms = line.split()
-                bounce_time = float(terms[1])
-                printv(f'Bounce = {bounce_time:.4f} s', verbose)
-                break
+    with open(filepath, 'rb') as f:
+        # search whole file in one go, rather than line-by-line
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                idx = mm.find(match_str.encode())
 
-        if bounce_time == 0.0:
-            printv('Bounce time not found! Returning 0.0 s', verbose)
+                if idx != -1:
+                    line_start = mm.rfind(b'\n', 0, idx) + 1
+                    line_end = mm.find(b'\n', idx)
+                    if line_end == -1:
+                        line_end = len(mm)
+
+                    terms = mm[line_start:line_end].split()
+                    bounce_time = float(terms[1])
+                    printv(f'Bounce = {bounce_time:.4f} s', verbose)
+
+    if bounce_time == 0.0:
+        printv('Bounce time not found! Returning 0.0 s', verbose)
 
     return bounce_time
 
@@ -1073,8 +1487,8 @@ def extract_timesteps_log(run, model, model_set,
                 arrays['nstep'] += [n]
                 arrays['time'] += [t]
 
-    table = pd.DataFrame(arrays)
-    table.set_index('chk', inplace=True)
+    chks = arrays.pop('chk')
+    table = pd.DataFrame(arrays, index=pd.Index(chks, name='chk'))
 
     if len(table) == 0:
         printv('No chk timesteps found!', verbose)
@@ -1127,14 +1541,14 @@ def get_tracers(run, model, model_set,
 
     # fall back on re-extracting
     if tracers is None:
-        conf = Config(name=config, verbose=verbose)
+        config = check_config(config, verbose=verbose)
 
         if mass_grid is None:
-            mass_def = conf.tracers('mass_grid')
+            mass_def = config.tracers('mass_grid')
             mass_grid = np.linspace(mass_def[0], mass_def[1], mass_def[2])
 
         if params is None:
-            params = conf.tracers('params')
+            params = config.tracers('params')
 
         if profiles is None:
             chk_list = find_chk(run=run,
@@ -1147,6 +1561,7 @@ def get_tracers(run, model, model_set,
                                         model_set=model_set,
                                         chk_list=chk_list,
                                         params=params,
+                                        config=config,
                                         verbose=verbose)
 
         tracers = extract_multi_tracers(mass_grid,
@@ -1186,12 +1601,12 @@ def try_mkdir(path, skip=False, verbose=True):
             cont = input('Overwrite (DESTROY)? (y/[n]): ')
 
             if cont == 'y' or cont == 'Y':
-                subprocess.run(['rm', '-r', path])
-                subprocess.run(['mkdir', path])
+                shutil.rmtree(path)
+                os.makedirs(path)
             elif cont == 'n' or cont == 'N':
                 sys.exit()
     else:
-        subprocess.run(['mkdir', '-p', path], check=True)
+        os.makedirs(path, exist_ok=True)
 
 
 def ensure_cache_dir_exists(model, model_set, verbose=True):
@@ -1204,4 +1619,7 @@ def ensure_cache_dir_exists(model, model_set, verbose=True):
     verbose : bool
     """
     path = paths.model_cache_path(model, model_set=model_set)
-    try_mkdir(path, skip=True, verbose=verbose)
+
+    if path not in _ensured_dirs:
+        try_mkdir(path, skip=True, verbose=verbose)
+        _ensured_dirs.add(path)
@@ -3,6 +3,8 @@
 
 For this module to work, you must set the bash environment variable:
     - FLASH_MODELS (path to directory containing FLASH models)
+Directory paths are cached on first use, so later changes to
+FLASH_MODELS within the same session are not picked up
 
 Function naming convention:
   - "_filename" name of file only
@@ -27,11 +29,13 @@ $FLASH_MODELS
 """
 
 import os
+from functools import lru_cache
 
 
 # ===============================================================
 #                      Flashbang
 # ===============================================================
+@lru_cache(maxsize=None)
 def top_path():
     """Return path to top-level repo directory
     """
@@ -41,8 +45,9 @@ def top_path():
     return path
 
 
+@lru_cache(maxsize=None)
 def config_filepath(name=None):
-    """Return path to config file
+    """Return path to config file (cached, as path is fixed for given name)
 
     parameters
     ----------
@@ -61,6 +66,7 @@ def config_filepath(name=None):
 # ===============================================================
 #                      Models
 # ===============================================================
+@lru_cache(maxsize=None)
 def model_path(model, model_set):
     """Return path to model directory
 
@@ -81,6 +87,7 @@ def model_path(model, model_set):
     return path
 
 
+@lru_cache(maxsize=None)
 def output_path(model, model_set):
     """Return path to model output directory
 
@@ -144,6 +151,7 @@ def flash_filepath(name, run, model, model_set, chk=None):
 # ===============================================================
 #                      Cache files
 # ===============================================================
+@lru_cache(maxsize=None)
 def cache_path():
     """Path to directory for cached files
     """
@@ -151,6 +159,7 @@ def cache_path():
     return path
 
 
+@lru_cache(maxsize=None)
 def model_cache_path(model, model_set):
     """Path to directory for keeping cached files
 
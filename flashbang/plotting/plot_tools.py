@@ -45,3 +45,28 @@ def setup_subplots(n_sub,
     n_cols = {False: 1, True: max_cols}.get(n_sub > 1)
     figsize = (n_cols*sub_figsize[0], n_rows*sub_figsize[1])
     return plt.subplots(n_rows, n_cols, figsize=figsize, **kwargs)
+
+
+def get_trans_segments(x, trans_idxs, y_min, y_max):
+    """Return vertical line segments of transition zones, for a LineCollection
+
+    returns : np.ndarray
+        shape (n_trans, 2, 2), of [[x, y_min], [x, y_max]] for each transition
+
+    parameters
+    ----------
+    x : []
+        x-axis profile
+    trans_idxs : [int]
+        zone indexes of transitions
+    y_min : float
+    y_max : float
+    """
+    trans_x = np.asarray(x)[np.asarray(trans_idxs, dtype=int)]
+
+    segments = np.empty((len(trans_x), 2, 2))
+    segments[:, :, 0] = trans_x[:, np.newaxis]
+    segments[:, 0, 1] = y_min
+    segments[:, 1, 1] = y_max
+
+    return segments
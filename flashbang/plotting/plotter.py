@@ -1,4 +1,5 @@
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 
 # flashbang
 from ..config import Config
@@ -144,10 +145,12 @@ class Plotter:
         ----------
         x : []
         y : []
+            if 2D, each column is plotted as a separate line
         marker : str
         linestyle : str
         color : str
-        label : str
+        label : str or [str]
+            if y is 2D, can give label for each column
         linewidth : float
         **kwargs
             valid kwargs for ax.plot()
@@ -168,6 +171,42 @@ class Plotter:
                      linewidth=linewidth,
                      **kwargs)
 
+    def plot_segments(self, segments,
+                      linestyle=None,
+                      color=None,
+                      linewidth=None,
+                      **kwargs
+                      ):
+        """Plot line segments on axis as a single LineCollection
+
+        Returns : LineCollection
+
+        Parameters
+        ----------
+        segments : np.ndarray
+            shape (n_lines, n_points, 2) of x, y points
+        linestyle : str
+        color : str
+        linewidth : float
+        **kwargs
+            valid kwargs for LineCollection()
+        """
+        if linestyle is None:
+            linestyle = self.linestyle
+        if linewidth is None:
+            linewidth = self.linewidth
+
+        segments = segments / [self.x_factor, self.y_factor]
+
+        collection = LineCollection(segments,
+                                    linestyle=linestyle,
+                                    color=color,
+                                    linewidth=linewidth,
+                                    **kwargs)
+        self.ax.add_collection(collection)
+
+        return collection
+
     # =======================================================
     #                      Axis
     # =======================================================
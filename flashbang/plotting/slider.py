@@ -2,6 +2,9 @@ import numpy as np
 from matplotlib.widgets import Slider
 import matplotlib.pyplot as plt
 
+# flashbang
+from .plot_tools import get_trans_segments
+
 
 class FlashSlider:
     def __init__(self,
@@ -60,14 +63,13 @@ class FlashSlider:
         """Return dict of labelled axis lines
         """
         lines = {}
-        n_vars = len(self.y_vars)
 
         for i, y_var in enumerate(self.y_vars):
             lines[y_var] = self.ax.lines[i]
 
         if self.trans:
-            for i, trans_key in enumerate(self.trans_dens):
-                lines[trans_key] = self.ax.lines[n_vars+i]
+            # all transition lines are held in a single LineCollection
+            lines['trans'] = self.ax.collections[0]
 
         self.lines = lines
 
@@ -86,40 +88,27 @@ class FlashSlider:
         if self.lines is None:
             self.get_ax_lines()
 
-        self.lines[y_var].set_xdata(x / self.x_factor)
-        self.lines[y_var].set_ydata(y / self.y_factor)
+        self.lines[y_var].set_data(x / self.x_factor, y / self.y_factor)
 
-    def update_trans_lines(self, chk, x, y):
+    def update_trans_lines(self, trans_idxs, x, y):
         """Update trans line values on plot
 
         Parameters
         ----------
-        chk : int
+        trans_idxs : [int]
+            zone indexes of transitions (see Simulation.get_trans_idxs)
         x : []
         y : []
+            y-values spanned by lines. Can pass just [y_min, y_max]
         """
         if self.trans:
-            for trans_key in self.trans_dens:
-                trans_x, trans_y = self.get_trans_xy(chk=chk,
-                                                     trans_key=trans_key,
-                                                     x=x,
-                                                     y=y)
-
-                self.update_ax_line(x=trans_x, y=trans_y, y_var=trans_key)
-
-    def get_trans_xy(self, chk, trans_key, x, y):
-        """Return x, y points of transition line, for given x-axis variable
-
-        parameters
-        ----------
-        chk : int
-        trans_key : str
-        x : []
-        y : []
-        """
-        trans_idx = self.chk_table.loc[chk, f'{trans_key}_i']
+            if self.lines is None:
+                self.get_ax_lines()
 
-        trans_x = np.array([x[trans_idx], x[trans_idx]])
-        trans_y = np.array([np.min(y), np.max(y)])
+            segments = get_trans_segments(x=x,
+                                          trans_idxs=trans_idxs,
+                                          y_min=np.min(y),
+                                          y_max=np.max(y))
 
-        return trans_x, trans_y
+            segments /= [self.x_factor, self.y_factor]
+            self.lines['trans'].set_segments(segments)
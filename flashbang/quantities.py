@@ -81,6 +81,54 @@ def get_density_zone(dens_array, dens):
     return zone_idx
 
 
+def get_density_zones(dens_profiles, dens):
+    """Return index of the zone closest to the given density, for multiple profiles
+
+    Vectorized version of get_density_zone(), for a 2D array of profiles,
+    and optionally multiple densities at once.
+    Uses the same binary search as get_density_zone() on every profile,
+    so zones match it exactly (including non-monotonic profiles, and
+    plateaus of equal densities, where the outermost zone is returned)
+
+    Returns : np.ndarray
+        zone index for each profile, shape (n_profiles,),
+        or (n_profiles, n_dens) if multiple densities given
+
+    parameters
+    ----------
+    dens_profiles : 2D array
+        zone density values of each profile, shape (n_profiles, n_zones)
+    dens : flt or [flt]
+        density (or densities) to search for
+    """
+    dens = np.asarray(dens, dtype=float)
+
+    n_zones = dens_profiles.shape[1]
+    max_idx = n_zones - 1
+    zone_idxs = np.empty((len(dens_profiles),) + dens.shape, dtype=int)
+
+    for i, profile in enumerate(dens_profiles):
+        dens_reverse = profile[::-1]  # need increasing density
+
+        # search each density separately: for multiple keys, searchsorted
+        # reuses bounds between keys, which changes results on unsorted profiles
+        idx = np.array([np.searchsorted(dens_reverse, d) for d in dens.flat])
+        idx = idx.reshape(dens.shape)
+
+        # neighbours either side of insertion point (see find_nearest_idx)
+        lower = np.clip(idx - 1, 0, max_idx)
+        upper = np.minimum(idx, max_idx)
+
+        use_lower = (idx == n_zones) | ((idx > 0)
+                                        & (np.abs(dens - dens_reverse[lower])
+                                           < np.abs(dens - dens_reverse[upper])))
+
+        trans_idx = np.where(use_lower, lower, upper)
+        zone_idxs[i] = max_idx - trans_idx  # flip back
+
+    return zone_idxs
+
+
 def get_mass_enclosed(radius, density, chk_h5py):
     """Calculate profile of enclosed mass (Msun) over given radius/density
 
@@ -94,17 +142,15 @@ def get_mass_enclosed(radius, density, chk_h5py):
         1D array of density values (cell-averaged)
     chk_h5py : h5py.File
     """
-    n_points = len(radius)
-    mass = np.zeros(n_points)
     cell_edges = get_cell_edges(chk_h5py)
 
     mass_left, mass_right = get_mass_halves(radius=radius,
                                             density=density,
                                             cell_edges=cell_edges)
 
-    mass[0] = mass_left[0]
-    for i in range(1, n_points):
-        mass[i] = mass[i-1] + mass_right[i-1] + mass_left[i]
+    # enclosed mass at cell centre = all cells below + left half of own cell
+    right_below = np.concatenate([[0.0], mass_right[:-1]])
+    mass = np.cumsum(mass_left + right_below)
 
     return mass * g_to_msun
 
@@ -156,8 +202,7 @@ def get_cell_edges(chk_h5py):
     # no. of cells per block
     nbx = chk_h5py['integer scalars'][0][1]
 
-    # leaf block indices
-    leaf_i = np.where(np.array(chk_h5py['node type']) == 1)[0]
+    leaf_i = get_leaf_blocks(chk_h5py)
 
     block_edges = chk_h5py['bounding box'][:, 0][leaf_i]
     edge_matrix = np.linspace(block_edges[:, 0], block_edges[:, 1], nbx+1)
@@ -170,3 +215,44 @@ def get_cell_edges(chk_h5py):
     cell_edges = np.concatenate([low_edges, [last_edge]])
 
     return cell_edges
+
+
+def get_cell_centres(cell_edges):
+    """Get radii of cell centres from cell edges
+
+    Returns: np.ndarray
+
+    parameters
+    ----------
+    cell_edges : np.ndarray
+        1D array of radii of cell edges (see get_cell_edges)
+    """
+    return 0.5 * (cell_edges[:-1] + cell_edges[1:])
+
+
+def get_cell_volumes(cell_edges):
+    """Get volumes of spherical cell shells from cell edges
+
+    Returns: np.ndarray
+
+    parameters
+    ----------
+    cell_edges : np.ndarray
+        1D array of radii of cell edges (see get_cell_edges)
+    """
+    return 4/3 * np.pi * (cell_edges[1:]**3 - cell_edges[:-1]**3)
+
+
+def get_leaf_blocks(chk_h5py):
+    """Get indices of leaf blocks, ordered by radius
+
+    Returns: np.ndarray
+
+    parameters
+    ----------
+    chk_h5py : h5py.File
+    """
+    leaf_i = np.where(np.array(chk_h5py['node type']) == 1)[0]
+    block_x = chk_h5py['coordinates'][:, 0][leaf_i]
+
+    return leaf_i[np.argsort(block_x, kind='stable')]
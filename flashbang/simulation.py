@@ -52,7 +52,6 @@ Nomenclature
 """
 import time
 import numpy as np
-import xarray as xr
 import pandas as pd
 from astropy import units
 import matplotlib.pyplot as plt
@@ -62,10 +61,10 @@ from . import load_save
 from .plotting import plot_tools
 from .plotting.plotter import Plotter
 from .plotting.slider import FlashSlider
-from .quantities import get_density_zone
+from .quantities import get_density_zones
 from .paths import model_path
 from .tools import ensure_sequence
-from .config import Config
+from .config import check_config
 
 
 class Simulation:
@@ -78,7 +77,8 @@ class Simulation:
                  load_all=True,
                  reload=False,
                  save=True,
-                 load_tracers=False):
+                 load_tracers=False,
+                 threads=1):
         """Object representing a 1D flash simulation
 
         parameters
@@ -89,10 +89,12 @@ class Simulation:
             Name of simulation directory containing .dat files, etc.
         model_set : str
             Name of higher-level model collection (see module docstring)
-        config : str
-            Name of config file to use, e.g. 'stir' for 'config/stir.ini'
+        config : str or Config
+            Name of config file to use, e.g. 'stir' for 'config/stir.ini',
+            or an already-loaded Config
         load_all : bool
-            Immediately load all model data (chk profiles, dat)
+            Immediately load all model data (chk profiles, dat).
+            Otherwise, dat and profiles are loaded on first access
         load_tracers : bool
             Extract mass tracers/trajectories from profiles
         reload : bool
@@ -101,6 +103,8 @@ class Simulation:
             Save extracted model data to temporary files (for faster loading)
         verbose : bool
             Print information to terminal
+        threads : int
+            Number of processes for extracting chk profiles in parallel
         """
         t0 = time.time()
         self.verbose = verbose
@@ -108,17 +112,30 @@ class Simulation:
         self.model = model
         self.model_set = model_set
         self.model_path = model_path(model, model_set=model_set)
+        self._reload = reload
+        self._save = save
+        self.threads = threads
 
-        self.dat = None                  # time-integrated data from .dat; see load_dat()
+        self._dat = None                 # time-integrated data from .dat; see dat
+        self._dat_arrays = {}            # raw dat columns; see get_dat_array()
         self.bounce = {}                 # bounce properties
         self.trans_dens = None           # transition densities (helmholtz models)
         self.mass_grid = None            # mass shells of tracers
         self.chk_table = pd.DataFrame()  # scalar chk quantities (trans_dens, time, etc.)
-        self.profiles = xr.Dataset()     # radial profile data for each timestep
+        self._trans_idx_arr = None       # trans zone arrays; see get_trans_idxs()
+        self._chk_row = None             # row of each chk in chk_table
+        self._profiles = None            # radial profile data for each timestep; see profiles
+        self._profile_arrays = {}        # raw profile arrays; see get_profile_array()
+        self._profile_xy = {}            # packed plotting arrays; see get_profile_xy()
+        self._profile_lims = {}          # [min, max] of profiles; see get_profile_lims()
+        self._chk_pos = None             # position of each chk in profiles
         self.tracers = None              # mass tracers/trajectories
         self.timesteps = None            # table of chk timesteps
+        self._title_times = None         # post-bounce time of each chk; see _get_title()
+        self._timestep_pos = None        # position of each chk in timesteps
+        self._title_cache = (None, None)  # last (chk, title_str)
 
-        self.config = Config(name=config, verbose=self.verbose)
+        self.config = check_config(config, verbose=self.verbose)
         self.trans_dens = self.config.trans('dens')
         self.setup_mass_grid()
         self.load_chk_table(reload=reload, save=save)
@@ -131,6 +148,154 @@ class Simulation:
         t1 = time.time()
         self.printv(f'Model load time: {t1-t0:.3f} s')
 
+    # =======================================================
+    #                   Accessing Data
+    # =======================================================
+    @property
+    def dat(self):
+        """Time-integrated data from .dat, loaded on first access (see load_dat())
+        """
+        if self._dat is None:
+            self.load_dat(reload=self._reload, save=self._save)
+
+        return self._dat
+
+    def get_dat_array(self, var):
+        """Return raw array of dat column
+
+        Arrays are cached on first access, to skip building
+        a pandas Series on each plot
+
+        Returns : np.ndarray
+
+        parameters
+        ----------
+        var : str
+        """
+        if var not in self._dat_arrays:
+            self._dat_arrays[var] = self.dat[var].to_numpy()
+
+        return self._dat_arrays[var]
+
+    @property
+    def profiles(self):
+        """Radial profiles for each chk, loaded on first access (see load_all_profiles())
+
+        If not already loaded, the cached profiles are opened lazily,
+        so values are only read from file when accessed
+        """
+        if self._profiles is None:
+            self.load_all_profiles(reload=self._reload, save=self._save, lazy=True)
+
+        return self._profiles
+
+    def get_profile_array(self, chk, var):
+        """Return raw profile array of variable at given chk
+
+        Arrays are cached on first access, so that repeated calls
+        (e.g. slider updates) only index numpy arrays, rather than
+        doing xarray label lookups
+
+        Returns : np.ndarray
+
+        parameters
+        ----------
+        chk : int
+        var : str
+        """
+        if var not in self._profile_arrays:
+            self._profile_arrays[var] = self.profiles[var].values
+
+        return self._profile_arrays[var][self._get_chk_pos(chk)]
+
+    def get_profile_xy(self, chk, x_var, y_var):
+        """Return packed x, y profile arrays at given chk, for plotting
+
+        The (x_var, y_var) pair is packed on first access into a single
+        float32 array of shape (n_chk, n_zones, 2), so that each slider
+        update is one contiguous fetch. Only for plotting: use
+        profiles or get_profile_array() for full-precision values
+
+        Returns : np.ndarray
+            shape (n_zones, 2)
+
+        parameters
+        ----------
+        chk : int
+        x_var : str
+        y_var : str
+        """
+        key = (x_var, y_var)
+
+        if key not in self._profile_xy:
+            x = self.profiles[x_var].values
+            y = self.profiles[y_var].values
+
+            xy = np.empty(x.shape + (2,), dtype=np.float32)
+            xy[:, :, 0] = x
+            xy[:, :, 1] = y
+            self._profile_xy[key] = xy
+
+        return self._profile_xy[key][self._get_chk_pos(chk)]
+
+    def get_profile_lims(self, chk, var):
+        """Return [min, max] of profile variable at given chk
+
+        Limits of all chks are computed on first access, so that
+        slider updates don't need to re-scan each profile
+
+        Returns : np.ndarray
+            shape (2,)
+
+        parameters
+        ----------
+        chk : int
+        var : str
+        """
+        if var not in self._profile_lims:
+            profile = self.profiles[var].values
+            lims = np.stack([profile.min(axis=1), profile.max(axis=1)], axis=1)
+            self._profile_lims[var] = lims
+
+        return self._profile_lims[var][self._get_chk_pos(chk)]
+
+    def _get_chk_pos(self, chk):
+        """Return position of chk along profiles chk dimension
+
+        parameters
+        ----------
+        chk : int
+        """
+        if self._chk_pos is None:
+            chks = self.profiles.coords['chk'].values
+            self._chk_pos = {c: i for i, c in enumerate(chks)}
+
+        return self._chk_pos[chk]
+
+    def get_trans_idxs(self, chk):
+        """Return zone indexes of transition densities for given chk(s)
+
+        Uses ndarray copies of chk_table columns to avoid pandas .loc lookups
+
+        Returns : np.ndarray
+            shape (n_trans,), or (n_chk, n_trans) if multiple chks given
+
+        parameters
+        ----------
+        chk : int or [int]
+        """
+        if self._trans_idx_arr is None:
+            self._trans_idx_arr = {key: self.chk_table[f'{key}_i'].to_numpy()
+                                   for key in self.trans_dens}
+            self._chk_row = {c: i for i, c in enumerate(self.chk_table.index)}
+
+        if np.isscalar(chk):
+            row = self._chk_row[chk]
+        else:
+            row = np.array([self._chk_row[c] for c in chk], dtype=int)
+
+        return np.stack([arr[row] for arr in self._trans_idx_arr.values()], axis=-1)
+
     # =======================================================
     #                      Setup/init
     # =======================================================
@@ -172,6 +337,7 @@ class Simulation:
         reload : bool
         save : bool
         """
+        self._trans_idx_arr = None
         self.chk_table = load_save.get_chk_table(run=self.run,
                                                  model=self.model,
                                                  model_set=self.model_set,
@@ -179,43 +345,84 @@ class Simulation:
                                                  save=save,
                                                  verbose=self.verbose)
 
-    def load_dat(self, reload=False, save=True):
+    def load_dat(self, reload=False, save=True, columns=None):
         """Load .dat file
 
         parameters
         ----------
         reload : bool
         save : bool
+        columns : [str]
+            only extract this subset of dat columns (see Config.dat('columns')).
+            Skips derived quantities, and doesn't save to cache
         """
-        self.dat = load_save.get_dat(run=self.run,
-                                     model=self.model,
-                                     model_set=self.model_set,
-                                     config=self.config,
-                                     reload=reload,
-                                     save=save,
-                                     verbose=self.verbose)
-
-    def load_all_profiles(self, reload=False, save=True):
+        cols_dict = None
+        derived = None
+
+        if columns is not None:
+            config_cols = self.config.dat('columns')
+            cols_dict = {'time': config_cols['time']}  # always needed
+            cols_dict.update({col: config_cols[col] for col in ensure_sequence(columns)})
+            derived = []
+            save = False
+
+        self._dat_arrays = {}
+        self._dat = load_save.get_dat(run=self.run,
+                                      model=self.model,
+                                      model_set=self.model_set,
+                                      cols_dict=cols_dict,
+                                      derived=derived,
+                                      config=self.config,
+                                      reload=reload,
+                                      save=save,
+                                      verbose=self.verbose)
+
+    def load_all_profiles(self, reload=False, save=True, lazy=False):
         """Load profiles for all available checkpoints
 
         parameters
         ----------
         reload : bool
         save : bool
+        lazy : bool
+            if loaded from cache, only read values on access
+            (e.g. one chk at a time for sliders)
         """
-        self.profiles = load_save.get_multiprofile(
-                                run=self.run,
-                                model=self.model,
-                                model_set=self.model_set,
-                                chk_list=self.chk_table.index,
-                                config=self.config,
-                                reload=reload,
-                                save=save,
-                                verbose=self.verbose)
+        self.close_profiles()  # release cache file, which may be rewritten below
+
+        self._profile_arrays = {}
+        self._profile_xy = {}
+        self._profile_lims = {}
+        self._chk_pos = None
+
+        dtype = None
+        if self.config.has_option('profiles', 'dtype'):
+            dtype = self.config.profiles('dtype')
+
+        self._profiles = load_save.get_multiprofile(
+                                 run=self.run,
+                                 model=self.model,
+                                 model_set=self.model_set,
+                                 chk_list=self.chk_table.index,
+                                 config=self.config,
+                                 reload=reload,
+                                 save=save,
+                                 threads=self.threads,
+                                 lazy=lazy,
+                                 dtype=dtype,
+                                 verbose=self.verbose)
+
+    def close_profiles(self):
+        """Close profiles, releasing the cache file if it was opened lazily
+        """
+        if self._profiles is not None:
+            self._profiles.close()
+            self._profiles = None
 
     def get_bounce_time(self):
         """Get bounce time (s) from log file
         """
+        self._title_times = None
         self.bounce['time'] = load_save.get_bounce_time(run=self.run,
                                                         model=self.model,
                                                         model_set=self.model_set,
@@ -234,6 +441,7 @@ class Simulation:
     def load_timesteps(self, reload=False, save=True):
         """Load table of chk timesteps
         """
+        self._title_times = None
         self.timesteps = load_save.get_timesteps(run=self.run,
                                                  model=self.model,
                                                  model_set=self.model_set,
@@ -271,15 +479,17 @@ class Simulation:
         for each profile timestep
         """
         self.printv('Finding transition zones')
+        self._trans_idx_arr = None
 
-        for key, trans_dens in self.trans_dens.items():
-            idx_list = np.zeros_like(self.chk_table.index)
+        # density profiles of all chks, shape (n_chk, n_zones)
+        dens_profiles = self.profiles['dens'].sel(chk=self.chk_table.index).values
 
-            for i, chk in enumerate(self.chk_table.index):
-                density = self.profiles.sel(chk=chk)['dens']
-                idx_list[i] = get_density_zone(density, trans_dens)
+        trans_dens = np.array(list(self.trans_dens.values()), dtype=float)
+        zone_idxs = get_density_zones(dens_profiles, trans_dens)  # (n_chk, n_trans)
+        zone_idxs = zone_idxs.astype(np.int64, copy=False)    # consistent chk_table dtype
 
-            self.chk_table[f'{key}_i'] = idx_list
+        for i, key in enumerate(self.trans_dens):
+            self.chk_table[f'{key}_i'] = zone_idxs[:, i]
 
     def get_tracers(self, reload=False, save=True):
         """Construct mass tracers from profile data (or load pre-extracted)
@@ -301,6 +511,7 @@ class Simulation:
                                              profiles=self.profiles,
                                              reload=reload,
                                              save=save,
+                                             config=self.config,
                                              verbose=self.verbose)
 
         # force reload if chks are missing
@@ -424,8 +635,10 @@ class Simulation:
         trans : bool
         """
         chk = self._parse_chk(chk)
-        chk = ensure_sequence(chk)
-        y_vars = ensure_sequence(y_vars)
+        if np.isscalar(chk):
+            chk = [chk]
+        if np.isscalar(y_vars):
+            y_vars = [y_vars]
         n_var = len(y_vars)
         fig, ax = plot_tools.setup_subplots(n_var,
                                             max_cols=max_cols,
@@ -504,7 +717,8 @@ class Simulation:
             only plot data, neglecting all titles/labels/scales
         """
         chk = self._parse_chk(chk)
-        chk = ensure_sequence(chk)
+        if np.isscalar(chk):
+            chk = [chk]
         title_str = self._get_title(chk=chk[0], title_str=title_str)
 
         self._check_trans(trans=trans)
@@ -532,14 +746,13 @@ class Simulation:
                        verbose=self.verbose)
 
         for i in chk:
-            profile = self.profiles.sel(chk=i)
-            x = profile[x_var]
-            y = profile[y_var]
+            x = self.get_profile_array(chk=i, var=x_var)
+            y = self.get_profile_array(chk=i, var=y_var)
 
             plot.plot(x, y, label=label, color=color)
 
-            if trans:
-                self._plot_trans_lines(x=x, y=y, plot=plot, chk=i)
+        if trans:
+            self._plot_chk_trans_lines(chks=chk, x_var=x_var, y_var=y_var, plot=plot)
 
         if not data_only:
             plot.set_all()
@@ -694,8 +907,8 @@ class Simulation:
         if zero_time:
             t_offset = self.bounce['time']
 
-        x = self.dat['time'] - t_offset
-        y = self.dat[y_var]
+        x = self.get_dat_array('time') - t_offset
+        y = self.get_dat_array(y_var)
 
         plot.plot(x, y, color=color, label=label)
 
@@ -754,12 +967,12 @@ class Simulation:
                        marker=marker,
                        verbose=self.verbose)
 
-        for mass in self.tracers['mass']:
-            x = self.tracers[x_var]
-            y = self.tracers.sel(mass=mass)[y_var]
-            label = f'{mass.values:.3f}'
+        # plot all tracers at once, with a column for each mass shell
+        x = self.tracers[x_var].transpose('chk', ...).values
+        y = self.tracers[y_var].transpose('chk', 'mass').values
+        labels = [f'{mass:.3f}' for mass in self.tracers['mass'].values]
 
-            plot.plot(x, y, label=label)
+        plot.plot(x, y, label=labels)
 
         if not data_only:
             plot.set_all()
@@ -804,12 +1017,14 @@ class Simulation:
         def update_slider(chk):
             chk = int(chk)
 
-            profile = self.profiles.sel(chk=chk)
-            x = profile[x_var]
-            y = profile[y_var]
+            x = self.get_profile_array(chk=chk, var=x_var)
+            y = self.get_profile_array(chk=chk, var=y_var)
 
-            slider.update_ax_line(x=x, y=y, y_var=y_var)
-            slider.update_trans_lines(chk=chk, x=x, y=y)
+            line.set_data(x / x_factor, y / y_factor)
+            if trans:
+                slider.update_trans_lines(trans_idxs=self.get_trans_idxs(chk),
+                                          x=x,
+                                          y=self.get_profile_lims(chk=chk, var=y_var))
 
             title_str = self._get_title(chk=chk)
             plot.set_title(title_str=title_str)
@@ -851,6 +1066,10 @@ class Simulation:
                                  linestyle=linestyle,
                                  marker=marker)
 
+        # direct reference to profile line, bound in update_slider()
+        slider.get_ax_lines()
+        line = slider.lines[y_var]
+
         slider.slider.on_changed(update_slider)
 
         return slider
@@ -888,14 +1107,18 @@ class Simulation:
         def update_slider(chk):
             chk = int(chk)
 
-            profile = self.profiles.sel(chk=chk)
-            x = profile[x_var]
+            x = self.get_profile_array(chk=chk, var=x_var)
 
-            slider.update_trans_lines(chk=chk, x=x, y=y_lims)
+            if trans:
+                slider.update_trans_lines(trans_idxs=self.get_trans_idxs(chk),
+                                          x=x,
+                                          y=y_lims)
+
+            x = x / x_factor
 
-            for y_var in y_vars:
-                y = profile[y_var]
-                slider.update_ax_line(x=x, y=y, y_var=y_var)
+            for y_var, line in lines:
+                y = self.get_profile_array(chk=chk, var=y_var)
+                line.set_data(x, y / y_factor)
 
             title_str = self._get_title(chk=chk)
             plot.set_title(title_str=title_str)
@@ -941,6 +1164,10 @@ class Simulation:
                                      ax=slider.ax,
                                      trans=trans)
 
+        # direct references to profile lines, bound in update_slider()
+        slider.get_ax_lines()
+        lines = [(y_var, slider.lines[y_var]) for y_var in y_vars]
+
         slider.slider.on_changed(update_slider)
 
         return slider
@@ -948,23 +1175,6 @@ class Simulation:
     # =======================================================
     #                      Plotting Tools
     # =======================================================
-    def _get_trans_xy(self, chk, trans_key, x, y):
-        """Return x, y points of transition line, for given x-axis variable
-
-        parameters
-        ----------
-        chk : int
-        trans_key : str
-        x : []
-        y : []
-        """
-        trans_idx = self.chk_table.loc[chk, f'{trans_key}_i']
-
-        trans_x = np.array([x[trans_idx], x[trans_idx]])
-        trans_y = np.array([np.min(y), np.max(y)])
-
-        return trans_x, trans_y
-
     def _get_title(self, chk, title_str=None):
         """Get title string
 
@@ -974,11 +1184,27 @@ class Simulation:
         title_str : str
         """
         if (title_str is None) and (chk is not None):
-            timestep = self.timesteps.loc[chk, 'time'] - self.bounce['time']
-            title_str = f't = {timestep:.3f} s'
+            if self._title_times is None:
+                self._setup_title_times()
+
+            cached_chk, cached_str = self._title_cache
+
+            if chk == cached_chk:
+                title_str = cached_str
+            else:
+                timestep = self._title_times[self._timestep_pos[chk]]
+                title_str = f't = {timestep:.3f} s'
+                self._title_cache = (chk, title_str)
 
         return title_str
 
+    def _setup_title_times(self):
+        """Precompute post-bounce timesteps of all chks, for plot titles
+        """
+        self._title_times = self.timesteps['time'].to_numpy() - self.bounce['time']
+        self._timestep_pos = {chk: i for i, chk in enumerate(self.timesteps.index)}
+        self._title_cache = (None, None)
+
     def _plot_trans_lines(self, x, y, plot, chk, linewidth=1):
         """Add transition line to axis
 
@@ -990,17 +1216,46 @@ class Simulation:
         chk : int
         linewidth : float
         """
-        for trans_key in self.trans_dens:
-            trans_x, trans_y = self._get_trans_xy(chk=chk,
-                                                  trans_key=trans_key,
-                                                  x=x,
-                                                  y=y)
-            plot.plot(x=trans_x,
-                      y=trans_y,
-                      linestyle='--',
-                      marker='',
-                      color='k',
-                      linewidth=linewidth)
+        trans_idxs = self.get_trans_idxs(chk)
+
+        segments = plot_tools.get_trans_segments(x=x,
+                                                 trans_idxs=trans_idxs,
+                                                 y_min=np.min(y),
+                                                 y_max=np.max(y))
+        plot.plot_segments(segments,
+                           linestyle='--',
+                           color='k',
+                           linewidth=linewidth)
+
+    def _plot_chk_trans_lines(self, chks, x_var, y_var, plot, linewidth=1):
+        """Add transition lines of multiple chk profiles to axis
+
+        All transition coordinates are gathered in one pass,
+        and plotted as a single LineCollection
+
+        parameters
+        ----------
+        chks : [int]
+        x_var : str
+        y_var : str
+        plot : Plotter
+        linewidth : float
+        """
+        trans_idxs = self.get_trans_idxs(chks)  # shape (n_chk, n_trans)
+        x_all = np.stack([self.get_profile_array(chk=c, var=x_var) for c in chks])
+        y_lims = np.stack([self.get_profile_lims(chk=c, var=y_var) for c in chks])
+
+        trans_x = np.take_along_axis(x_all, trans_idxs.astype(int), axis=1)
+
+        segments = np.empty(trans_x.shape + (2, 2))
+        segments[:, :, :, 0] = trans_x[:, :, np.newaxis]
+        segments[:, :, 0, 1] = y_lims[:, np.newaxis, 0]
+        segments[:, :, 1, 1] = y_lims[:, np.newaxis, 1]
+
+        plot.plot_segments(segments.reshape(-1, 2, 2),
+                           linestyle='--',
+                           color='k',
+                           linewidth=linewidth)
 
     def _check_factors(self, x_var, y_var, x_factor, y_factor):
         """Check if factors provided, otherwise use default
@@ -1050,10 +1305,11 @@ class Simulation:
         ----------
         chk : str, int, or [int]
         """
-        if chk == 'bounce':
-            chk = self.bounce['chk']
-        elif chk == 'last':
-            chk = self.chk_table.index[-1]
+        if isinstance(chk, str):
+            if chk == 'bounce':
+                chk = self.bounce['chk']
+            elif chk == 'last':
+                chk = self.chk_table.index[-1]
 
         return chk
 
@@ -89,7 +89,8 @@ def main(run, model, model_set,
                             model=model,
                             model_set=model_set,
                             reload=True,
-                            save=save)
+                            save=save,
+                            threads=threads)
 
     t1 = time.time()
     print(f'Time taken: {t1-t0:.2f} s')